@@ -2,18 +2,24 @@
 
 This package provides:
 - Document loading and chunking (documents.py)
-- Chroma vector store (vectorstore.py)
+- Chroma vector store (vectorstore.py) and optional FAISS backend (faiss_store.py)
 - Basic and secure QA chains (qa.py, secure_qa.py)
 - Guardrails, prompt injection defense, and evaluation
+- Semantic answer cache for paraphrased queries (semantic_cache.py)
+- Persistent query and document embedding cache (embedding_cache.py)
 - End-to-end pipeline orchestration (pipeline.py)
 """
 
 __version__ = "0.2.0"
 
+from typing import TYPE_CHECKING, Any
+
 from .config import Settings
 from .guardrails import ErrorCode
-from .pipeline import RagPipeline
-from .services.secure_qa import SecureQueryResult
+
+if TYPE_CHECKING:
+    from .pipeline import RagPipeline
+    from .services.secure_qa import SecureQueryResult
 
 __all__ = [
     "__version__",
@@ -22,3 +28,22 @@ __all__ = [
     "ErrorCode",
     "SecureQueryResult",
 ]
+
+
+# Exports that pull in LangChain are resolved on first access, so importing
+# the package (e.g. for the CLI's --help) stays cheap.
+_LAZY_EXPORTS = {
+    "RagPipeline": ".pipeline",
+    "SecureQueryResult": ".services.secure_qa",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,10 +3,19 @@
 import argparse
 import os
 import sys
-from typing import List
+from typing import TYPE_CHECKING, Tuple
 
-from .config import Settings
-from .pipeline import RagPipeline
+from .config import QUANTIZATION_MODES, VECTOR_BACKENDS, Settings
+
+if TYPE_CHECKING:
+    from .pipeline import RagPipeline
+
+# Sample queries for Assignment 2 batch mode
+_SAMPLE_QUERIES: Tuple[str, ...] = (
+    "What is Crosswalk guards?",
+    "What to do if moving through an intersection with a green signal?",
+    "What to do when approached by an emergency vehicle?",
+)
 
 
 def _print_helper_prompt() -> None:
@@ -21,7 +30,7 @@ def _print_helper_prompt() -> None:
     print("- Specific queries yield better answers.")
 
 
-def _interactive_mode(pipeline: RagPipeline) -> None:
+def _interactive_mode(pipeline: "RagPipeline") -> None:
     """Run interactive Q&A loop."""
     print("\nRAG System Initialized (Type 'exit' to quit, 'help' for instructions): ")
     while True:
@@ -35,13 +44,9 @@ def _interactive_mode(pipeline: RagPipeline) -> None:
         print("\n" + response)
 
 
-def sample_queries() -> List[str]:
+def sample_queries() -> Tuple[str, ...]:
     """Return sample queries for Assignment 2 batch mode."""
-    return [
-        "What is Crosswalk guards?",
-        "What to do if moving through an intersection with a green signal?",
-        "What to do when approached by an emergency vehicle?",
-    ]
+    return _SAMPLE_QUERIES
 
 
 def _build_settings(args: argparse.Namespace) -> Settings:
@@ -50,6 +55,8 @@ def _build_settings(args: argparse.Namespace) -> Settings:
         data_dir=args.data_dir,
         output_dir=args.output_dir,
         persist_directory=args.persist_dir,
+        vector_backend=args.vector_backend,
+        quantize=args.quantize,
         chunk_size=args.chunk_size,
         chunk_overlap=args.chunk_overlap,
         k=args.k,
@@ -74,6 +81,18 @@ def main() -> None:
     parser.add_argument(
         "--persist-dir", default="chroma_db", help="Chroma persistence dir"
     )
+    parser.add_argument(
+        "--vector-backend",
+        choices=VECTOR_BACKENDS,
+        default="chroma",
+        help="Vector store backend (faiss requires faiss-cpu)",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=QUANTIZATION_MODES,
+        default="none",
+        help="Stored vector encoding for the faiss backend",
+    )
     parser.add_argument("--output-dir", default="output", help="Output directory")
     parser.add_argument("--k", type=int, default=3, help="Number of retrieved docs")
     parser.add_argument("--chunk-size", type=int, default=1000, help="Chunk size")
@@ -93,6 +112,9 @@ def main() -> None:
         print("\nPlease set the required environment variables (e.g., in a .env file).")
         sys.exit(1)
 
+    # Deferred so --help and configuration errors skip the LangChain imports
+    from .pipeline import RagPipeline
+
     pipeline = RagPipeline(settings)
     try:
         pipeline.setup(rebuild=args.rebuild)
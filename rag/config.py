@@ -8,6 +8,12 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Supported vector store backends (Settings.vector_backend)
+VECTOR_BACKENDS = ("chroma", "faiss")
+
+# Stored vector encodings for the FAISS backend (Settings.quantize)
+QUANTIZATION_MODES = ("none", "sq8", "pq")
+
 
 @dataclass
 class Settings:
@@ -21,19 +27,31 @@ class Settings:
     data_dir: str = "data"
     output_dir: str = "output"
     persist_directory: str = "chroma_db"
+    vector_backend: str = "chroma"
+    quantize: str = "none"
 
     # Document processing
     chunk_size: int = 1000
     chunk_overlap: int = 200
     k: int = 3
+    embedding_batch_size: int = 64
+    embedding_concurrency: int = 4
 
     # LLM & Embeddings
     model: str = "gemini-2.5-flash"
     temperature: float = 1.0
+    batch_concurrency: int = 4
+
+    # Caching
+    semantic_cache_threshold: float = 0.95
 
     # Guardrails & Security (Assignment 3)
     retrieval_threshold: float = 0.3
     llm_timeout_seconds: int = 30
+    # HTTP attempts per secure-query LLM call (1 = no retries), so it times
+    # out after at most llm_timeout_seconds * llm_max_attempts; the basic
+    # RetrievalQA chain keeps the client's default timeout and retries
+    llm_max_attempts: int = 1
     max_response_words: int = 500
 
     # API keys (loaded from environment)
@@ -47,4 +65,18 @@ class Settings:
             errors.append("GOOGLE_API_KEY not found in environment variables.")
         if not self.jina_api_key:
             errors.append("JINA_API_KEY not found in environment variables.")
+        if self.vector_backend not in VECTOR_BACKENDS:
+            errors.append(
+                f"Unknown vector backend {self.vector_backend!r}; "
+                f"expected one of {', '.join(VECTOR_BACKENDS)}."
+            )
+        if self.quantize not in QUANTIZATION_MODES:
+            errors.append(
+                f"Unknown quantization {self.quantize!r}; "
+                f"expected one of {', '.join(QUANTIZATION_MODES)}."
+            )
+        elif self.quantize != "none" and self.vector_backend != "faiss":
+            errors.append("Quantization requires the faiss vector backend.")
+        if self.llm_max_attempts < 1:
+            errors.append("llm_max_attempts must be at least 1.")
         return errors
@@ -0,0 +1,148 @@
+"""Persistent on-disk cache for query and document embeddings."""
+
+import atexit
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# Recent query vectors kept in memory in front of the on-disk cache
+QUERY_MEMORY_CACHE_SIZE = 1024
+
+# Keys per SELECT ... IN (...) lookup, well under SQLite's variable limit
+LOOKUP_BATCH_SIZE = 500
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that caches query and document vectors on disk.
+
+    Vectors are stored as raw float32 bytes in a SQLite database keyed by the
+    SHA-256 of the model name, input kind and text, so repeated questions and
+    unchanged chunks on a rebuild skip the embedding API call across runs.
+    One connection is shared by the embedding worker threads; every access
+    holds ``_lock``.
+    The most recent query vectors are also kept in an in-memory LRU, since a
+    query is typically embedded more than once per request (semantic cache
+    lookup, then retrieval).
+    """
+
+    def __init__(self, embeddings: Embeddings, path: str) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            embeddings: Underlying embedding model.
+            path: SQLite database path (opened lazily on first use).
+        """
+        self.embeddings = embeddings
+        self.path = path
+        self.model_name: str = getattr(embeddings, "model_name", "")
+        self._db: Optional[sqlite3.Connection] = None
+        self._recent: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _key(self, kind: str, text: str) -> bytes:
+        raw = f"{self.model_name}\0{kind}\0{text}"
+        return hashlib.sha256(raw.encode("utf-8")).digest()
+
+    def _open(self) -> sqlite3.Connection:
+        """Return the cache database, opening it on first use (hold _lock)."""
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+        return self._db
+
+    def _get_many(self, keys: List[bytes]) -> Dict[bytes, bytes]:
+        """Return the stored vectors for keys that are cached (hold _lock)."""
+        db = self._open()
+        found: Dict[bytes, bytes] = {}
+        for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            batch = keys[start : start + LOOKUP_BATCH_SIZE]
+            found.update(
+                db.execute(
+                    "SELECT key, vector FROM embeddings WHERE key IN "
+                    f"({', '.join('?' * len(batch))})",
+                    batch,
+                )
+            )
+        return found
+
+    def _put_many(self, items: List[Tuple[bytes, List[float]]]) -> None:
+        """Store (key, vector) pairs as float32 bytes (hold _lock)."""
+        db = self._open()
+        db.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [
+                (key, np.asarray(vector, dtype=np.float32).tobytes())
+                for key, vector in items
+            ],
+        )
+        db.commit()
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, sending only cache misses to the underlying model."""
+        keys = [self._key("document", text) for text in texts]
+        with self._lock:
+            found = self._get_many(keys)
+        blobs = [found.get(key) for key in keys]
+
+        vectors: List[Optional[List[float]]] = [
+            None if blob is None else np.frombuffer(blob, dtype=np.float32).tolist()
+            for blob in blobs
+        ]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fresh = self.embeddings.embed_documents([texts[i] for i in missing])
+            with self._lock:
+                self._put_many([(keys[i], vector) for i, vector in zip(missing, fresh)])
+            for i, vector in zip(missing, fresh):
+                vectors[i] = vector
+            logger.debug(
+                "Embedded %d of %d documents (%d cached)",
+                len(missing),
+                len(texts),
+                len(texts) - len(missing),
+            )
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, serving repeats from memory or the on-disk cache."""
+        key = self._key("query", text)
+        with self._lock:
+            vector = self._recent.get(key)
+            if vector is not None:
+                self._recent.move_to_end(key)
+                return list(vector)
+            blob = self._get_many([key]).get(key)
+
+        if blob is not None:
+            vector = np.frombuffer(blob, dtype=np.float32).tolist()
+        else:
+            vector = self.embeddings.embed_query(text)
+            with self._lock:
+                self._put_many([(key, vector)])
+
+        with self._lock:
+            self._recent[key] = vector
+            if len(self._recent) > QUERY_MEMORY_CACHE_SIZE:
+                self._recent.popitem(last=False)
+        return list(vector)
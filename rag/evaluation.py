@@ -4,32 +4,52 @@ Provides faithfulness checking (LLM-based) and retrieval relevance scoring
 for measuring answer quality and retrieval effectiveness.
 """
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Optional, Tuple
 
+import numpy as np
 from langchain_core.documents import Document
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage
 
 logger = logging.getLogger(__name__)
 
-FAITHFULNESS_PROMPT: str = """You are evaluating whether an answer is supported by the provided context.
+# Faithfulness prompt, split around the context and answer so each call is a
+# plain concatenation rather than a str.format parse
+_FAITHFULNESS_PREFIX: str = """You are evaluating whether an answer is supported by the provided context.
 
 Context:
-{context}
+"""
+_FAITHFULNESS_MID: str = """
 
 Answer:
-{answer}
+"""
+_FAITHFULNESS_SUFFIX: str = """
 
 Is this answer fully supported by the context above? Answer with exactly one word: Yes or No."""
 
+# Faithfulness verdicts kept in memory, keyed by model and prompt inputs
+FAITHFULNESS_CACHE_SIZE = 2048
+_faithfulness_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_faithfulness_lock = threading.Lock()
+
+
+def _faithfulness_key(answer: str, context: str, llm: BaseChatModel) -> bytes:
+    """Return the cache key for a faithfulness check of answer against context."""
+    raw = "\0".join((str(getattr(llm, "model", "")), answer, context))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
 
-def _distance_to_similarity(distance: float) -> float:
-    """Convert Chroma L2 distance to 0-1 similarity score.
 
-    Chroma returns distance where lower = more similar.
+def _distances_to_similarities(distances: np.ndarray) -> np.ndarray:
+    """Convert Chroma L2 distances to 0-1 similarity scores.
+
+    Chroma returns distance where lower = more similar. Negative distances
+    map to 1.0.
     """
-    return 1.0 / (1.0 + distance) if distance >= 0 else 1.0
+    return 1.0 / (1.0 + np.maximum(distances, 0.0))
 
 
 def evaluate_faithfulness(
@@ -39,6 +59,9 @@ def evaluate_faithfulness(
 ) -> Tuple[str, bool]:
     """Use LLM to check if answer is supported by the retrieved context.
 
+    Verdicts are cached per model, answer and context, so repeated answers
+    over the same retrieved chunks cost one evaluation call.
+
     Args:
         answer: The generated answer to evaluate.
         context: The retrieved context used to generate the answer.
@@ -50,18 +73,36 @@ def evaluate_faithfulness(
     if not answer or not context:
         return "N/A", False
 
+    answer, context = answer[:1000], context[:3000]
+    key = _faithfulness_key(answer, context, llm)
+    with _faithfulness_lock:
+        score = _faithfulness_cache.get(key)
+        if score is not None:
+            _faithfulness_cache.move_to_end(key)
+            return score, score == "Yes"
+
     try:
-        prompt = FAITHFULNESS_PROMPT.format(
-            context=context[:3000], answer=answer[:1000]
+        prompt = (
+            _FAITHFULNESS_PREFIX
+            + context
+            + _FAITHFULNESS_MID
+            + answer
+            + _FAITHFULNESS_SUFFIX
         )
         response = llm.invoke([HumanMessage(content=prompt)])
         text = response.content.strip().upper() if hasattr(response, "content") else ""
         is_faithful = "YES" in text[:10]
-        return "Yes" if is_faithful else "No", is_faithful
     except Exception as exc:
         logger.warning("Faithfulness evaluation failed: %s", exc)
         return "N/A", False
 
+    score = "Yes" if is_faithful else "No"
+    with _faithfulness_lock:
+        _faithfulness_cache[key] = score
+        if len(_faithfulness_cache) > FAITHFULNESS_CACHE_SIZE:
+            _faithfulness_cache.popitem(last=False)
+    return score, is_faithful
+
 
 def compute_retrieval_relevance(
     docs_with_scores: List[Tuple[Document, float]],
@@ -81,8 +122,12 @@ def compute_retrieval_relevance(
     if not docs_with_scores:
         return 0, None, True
 
-    scores = [_distance_to_similarity(score) for _, score in docs_with_scores]
-    top_score = max(scores) if scores else None
-    below_threshold = top_score is not None and top_score < similarity_threshold
+    distances = np.fromiter(
+        (score for _, score in docs_with_scores),
+        dtype=np.float64,
+        count=len(docs_with_scores),
+    )
+    top_score = float(_distances_to_similarities(distances).max())
+    below_threshold = top_score < similarity_threshold
 
     return len(docs_with_scores), top_score, below_threshold
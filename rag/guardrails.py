@@ -8,7 +8,8 @@ import logging
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from itertools import islice
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,7 @@ class ErrorCode(str, Enum):
 
 
 # Driving/road rules keywords for off-topic detection
-DRIVING_TOPIC_KEYWORDS: List[str] = [
+DRIVING_TOPIC_KEYWORDS: Tuple[str, ...] = (
     "drive",
     "driving",
     "driver",
@@ -61,7 +62,15 @@ DRIVING_TOPIC_KEYWORDS: List[str] = [
     "right of way",
     "turn",
     "merge",
-]
+)
+
+# All topic keywords as one alternation: a single C-level scan per query
+# instead of a Python loop of substring checks
+DRIVING_TOPIC_REGEX = re.compile("|".join(map(re.escape, DRIVING_TOPIC_KEYWORDS)))
+
+# Single-word keywords, matched against query tokens with a set lookup first
+_SINGLE_TOKEN_KEYWORDS = frozenset(kw for kw in DRIVING_TOPIC_KEYWORDS if " " not in kw)
+_TOKEN_PATTERN = re.compile(r"[a-z]+")
 
 # PII detection patterns
 PHONE_PATTERN = re.compile(
@@ -69,12 +78,31 @@ PHONE_PATTERN = re.compile(
 )
 EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
 LICENSE_PLATE_PATTERN = re.compile(
-    r"\b[A-Z]{2,3}\s*\d{2,4}\b|\b\d{2,4}\s*[A-Z]{2,3}\b",
-    re.IGNORECASE,
+    r"\b[A-Za-z]{2,3}\s*\d{2,4}\b|\b\d{2,4}\s*[A-Za-z]{2,3}\b"
 )
 
+# Replacement token per PII type, in reporting order
+PII_REPLACEMENTS = {
+    "phone": "[REDACTED_PHONE]",
+    "email": "[REDACTED_EMAIL]",
+    "license_plate": "[REDACTED_PLATE]",
+}
+
+# All PII patterns fused into one alternation so a single scan finds every type.
+# The plate alternative must not start a match whose digits begin a phone number
+# (e.g. "is 902-555-0199"), preserving the phone-first priority of separate passes.
+PII_COMBINED = re.compile(
+    rf"(?P<phone>{PHONE_PATTERN.pattern})"
+    rf"|(?P<email>{EMAIL_PATTERN.pattern})"
+    rf"|(?P<license_plate>\b[A-Za-z]{{2,3}}\s*(?!{PHONE_PATTERN.pattern})\d{{2,4}}\b"
+    r"|\b\d{2,4}\s*[A-Za-z]{2,3}\b)"
+)
 
-@dataclass
+# A word, as delimited by str.split()
+WORD_PATTERN = re.compile(r"\S+")
+
+
+@dataclass(slots=True, frozen=True)
 class GuardrailResult:
     """Result of a single guardrail check."""
 
@@ -114,16 +142,15 @@ def check_query_length(query: str, max_length: int = 500) -> GuardrailResult:
     return GuardrailResult(passed=True)
 
 
-def check_off_topic(query: str) -> GuardrailResult:
+def check_off_topic(query_lower: str) -> GuardrailResult:
     """Check if query is related to driving/road rules (Nova Scotia context).
 
     Args:
-        query: The user's input query.
+        query_lower: The user's query, already stripped and lowercased.
 
     Returns:
         GuardrailResult with passed=False if off-topic, else passed=True.
     """
-    query_lower = query.lower().strip()
     if not query_lower:
         return GuardrailResult(
             passed=False,
@@ -131,9 +158,13 @@ def check_off_topic(query: str) -> GuardrailResult:
             triggered=["empty_query"],
         )
 
-    for keyword in DRIVING_TOPIC_KEYWORDS:
-        if keyword in query_lower:
-            return GuardrailResult(passed=True)
+    # Fast path: a query token is itself a keyword
+    if not _SINGLE_TOKEN_KEYWORDS.isdisjoint(_TOKEN_PATTERN.findall(query_lower)):
+        return GuardrailResult(passed=True)
+
+    # Substring fallback: multi-word phrases and keywords inside longer words
+    if DRIVING_TOPIC_REGEX.search(query_lower):
+        return GuardrailResult(passed=True)
 
     # Allow very short queries that might be abbreviations
     if len(query_lower) < 10:
@@ -156,22 +187,16 @@ def check_and_sanitize_pii(query: str) -> GuardrailResult:
     Returns:
         GuardrailResult with sanitized_query and warning if PII found; otherwise passed.
     """
-    sanitized = query
-    pii_found: List[str] = []
-
-    if PHONE_PATTERN.search(query):
-        pii_found.append("phone")
-        sanitized = PHONE_PATTERN.sub("[REDACTED_PHONE]", sanitized)
+    found: set[str] = set()
 
-    if EMAIL_PATTERN.search(query):
-        pii_found.append("email")
-        sanitized = EMAIL_PATTERN.sub("[REDACTED_EMAIL]", sanitized)
+    def _replace(match: re.Match[str]) -> str:
+        found.add(match.lastgroup)
+        return PII_REPLACEMENTS[match.lastgroup]
 
-    if LICENSE_PLATE_PATTERN.search(query):
-        pii_found.append("license_plate")
-        sanitized = LICENSE_PLATE_PATTERN.sub("[REDACTED_PLATE]", sanitized)
+    sanitized, num_redacted = PII_COMBINED.subn(_replace, query)
 
-    if pii_found:
+    if num_redacted:
+        pii_found = [name for name in PII_REPLACEMENTS if name in found]
         logger.warning("Guardrail triggered: PII detected (%s)", ", ".join(pii_found))
         return GuardrailResult(
             passed=True,
@@ -189,6 +214,9 @@ def check_and_sanitize_pii(query: str) -> GuardrailResult:
 def check_response_length(response: str, max_words: int = 500) -> GuardrailResult:
     """Cap responses to max_words.
 
+    Scanning stops after max_words + 1 words, so long responses are never
+    fully tokenized.
+
     Args:
         response: The LLM response text.
         max_words: Maximum allowed word count.
@@ -196,14 +224,11 @@ def check_response_length(response: str, max_words: int = 500) -> GuardrailResul
     Returns:
         GuardrailResult with sanitized_query (truncated) if over limit.
     """
-    word_count = len(response.split())
+    word_count = sum(1 for _ in islice(WORD_PATTERN.finditer(response), max_words + 1))
     if word_count > max_words:
-        logger.warning(
-            "Guardrail triggered: Response too long (%d > %d words)",
-            word_count,
-            max_words,
-        )
-        truncated = " ".join(response.split()[:max_words]) + "... [response truncated]"
+        logger.warning("Guardrail triggered: Response too long (> %d words)", max_words)
+        words = islice(WORD_PATTERN.finditer(response), max_words)
+        truncated = " ".join(m.group() for m in words) + "... [response truncated]"
         return GuardrailResult(
             passed=True,
             triggered=["response_length_limit"],
@@ -212,7 +237,7 @@ def check_response_length(response: str, max_words: int = 500) -> GuardrailResul
     return GuardrailResult(passed=True)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class InputGuardrailResult:
     """Result of applying all input guardrails."""
 
@@ -245,8 +270,8 @@ def apply_input_guardrails(query: str) -> InputGuardrailResult:
             triggered=result.triggered,
         )
 
-    # 2. Off-topic
-    result = check_off_topic(query)
+    # 2. Off-topic (normalized once here rather than inside each check)
+    result = check_off_topic(query.strip().lower())
     if not result.passed:
         return InputGuardrailResult(
             should_proceed=False,
@@ -4,9 +4,15 @@ Provides input sanitization (detection of injection patterns), instruction-data
 separation via delimiters, and output validation to prevent prompt leakage.
 """
 
+import functools
 import logging
 import re
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
+
+try:
+    import re2 as _injection_re
+except ImportError:  # optional: google-re2 gives linear-time matching
+    _injection_re = re
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +37,26 @@ INJECTION_PATTERNS: List[str] = [
     r"developer\s+mode",
 ]
 
-INJECTION_REGEX = re.compile(
-    "|".join(f"({p})" for p in INJECTION_PATTERNS), re.IGNORECASE
+# RE2's \s only matches ASCII whitespace; this class spells out every
+# character the stdlib \s matches (str.isspace), so NBSP, \v, em space etc.
+# cannot be used to split a pattern and slip past the RE2 engine.
+_UNICODE_WHITESPACE_CLASS: str = (
+    r"[\t\n\x{0b}\f\r\x{1c}-\x{1f} \x{85}\x{a0}\x{1680}\x{2000}-\x{200a}"
+    r"\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]"
+)
+
+
+def _engine_pattern(pattern: str) -> str:
+    """Adapt a stdlib pattern to the active regex engine."""
+    if _injection_re is re:
+        return pattern
+    return pattern.replace(r"\s", _UNICODE_WHITESPACE_CLASS)
+
+
+# Compiled with RE2 when installed (no backtracking), else the stdlib engine.
+# Both use leftmost-first alternation, so they report the same matches.
+INJECTION_REGEX = _injection_re.compile(
+    "(?i)" + "|".join(f"(?:{_engine_pattern(p)})" for p in INJECTION_PATTERNS)
 )
 
 # Standard refusal message for jailbreak/injection attempts
@@ -60,9 +84,27 @@ CRITICAL RULES:
 6. Keep answers concise and factual."""
 
 
+# Distinct queries whose injection scan results are kept in memory
+SANITIZE_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=SANITIZE_CACHE_SIZE)
+def _scan_injection(query: str) -> Tuple[str, ...]:
+    """Return the matched injection snippets for query (cached per query)."""
+    return tuple(m.group(0)[:50] for m in INJECTION_REGEX.finditer(query))
+
+
+def sanitize_cache_info() -> Any:
+    """Return the scan cache's CacheInfo (hits, misses, maxsize, currsize)."""
+    return _scan_injection.cache_info()
+
+
 def sanitize_input(query: str) -> Tuple[str, bool, List[str]]:
     """Scan user query for prompt injection patterns.
 
+    Scan results are cached per query string, so repeated questions skip
+    the regex pass.
+
     Args:
         query: The user's input query.
 
@@ -70,14 +112,7 @@ def sanitize_input(query: str) -> Tuple[str, bool, List[str]]:
         Tuple of (sanitized_query, was_blocked, triggered_patterns).
         If blocked, returns original query and was_blocked=True.
     """
-    triggered: List[str] = []
-    matches = INJECTION_REGEX.findall(query)
-
-    for match_tuple in matches:
-        for m in match_tuple:
-            if m:
-                triggered.append(m[:50])
-                break
+    triggered = list(_scan_injection(query))
 
     if triggered:
         logger.warning("Prompt injection detected: %s", triggered)
@@ -0,0 +1,106 @@
+"""Semantic answer cache for near-duplicate queries.
+
+Query embeddings are bucketed with random-projection LSH (one bit per random
+hyperplane), so a lookup only compares against cached queries that hash to
+the same or a neighbouring bucket instead of scanning every entry.
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Cache answers keyed by query embedding, matched by cosine similarity."""
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        num_planes: int = 8,
+        seed: int = 0,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cached answer to be reused.
+            num_planes: Number of random hyperplanes (bits per LSH bucket key).
+            seed: Seed for the random projection so bucketing is reproducible.
+        """
+        self.threshold = threshold
+        self.num_planes = num_planes
+        self._rng = np.random.default_rng(seed)
+        self._planes: Optional[np.ndarray] = None
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._answers: List[str] = []
+        self._buckets: Dict[bytes, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._vectors = np.empty((0, 0), dtype=np.float32)
+            self._answers.clear()
+            self._buckets.clear()
+
+    def _normalize(self, embedding: Sequence[float]) -> np.ndarray:
+        """Return the embedding as a unit-length float32 vector."""
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _bucket_keys(self, vec: np.ndarray) -> List[bytes]:
+        """Return the bucket key for vec followed by all 1-bit neighbours."""
+        if self._planes is None:
+            self._planes = self._rng.standard_normal(
+                (self.num_planes, vec.shape[0])
+            ).astype(np.float32)
+        bits = (self._planes @ vec) >= 0
+        keys = [np.packbits(bits).tobytes()]
+        for i in range(self.num_planes):
+            bits[i] = not bits[i]
+            keys.append(np.packbits(bits).tobytes())
+            bits[i] = not bits[i]
+        return keys
+
+    def get(self, embedding: Sequence[float]) -> Optional[str]:
+        """Return the cached answer most similar to embedding, if above threshold."""
+        if not self._answers:
+            return None
+        vec = self._normalize(embedding)
+        with self._lock:
+            candidates = [
+                idx
+                for key in self._bucket_keys(vec)
+                for idx in self._buckets.get(key, ())
+            ]
+            if not candidates:
+                return None
+
+            sims = self._vectors[candidates] @ vec
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+            logger.debug("Semantic cache hit (similarity %.4f)", sims[best])
+            return self._answers[candidates[best]]
+
+    def add(self, embedding: Sequence[float], answer: str) -> None:
+        """Store answer under the given query embedding."""
+        vec = self._normalize(embedding)
+        with self._lock:
+            idx = len(self._answers)
+            if idx == self._vectors.shape[0]:
+                # Grow the packed matrix geometrically so appends stay amortized O(1)
+                grown = np.empty((max(16, idx * 2), vec.shape[0]), dtype=np.float32)
+                if idx:
+                    grown[:idx] = self._vectors
+                self._vectors = grown
+            self._vectors[idx] = vec
+            self._answers.append(answer)
+            self._buckets.setdefault(self._bucket_keys(vec)[0], []).append(idx)
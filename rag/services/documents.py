@@ -1,9 +1,11 @@
 """Document loading and splitting for the RAG pipeline."""
 
 import glob
+import hashlib
 import logging
 import os
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
@@ -12,9 +14,24 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 logger = logging.getLogger(__name__)
 
 
+def _load_pdf(pdf_file: str) -> Tuple[List[Document], Optional[str]]:
+    """Load one PDF, returning its pages and an error message on failure.
+
+    Module-level so it can be pickled for worker processes; errors are
+    returned rather than raised so one bad file does not abort the rest.
+    """
+    try:
+        return PyPDFLoader(pdf_file).load(), None
+    except Exception as exc:
+        return [], str(exc)
+
+
 def load_documents(data_dir: str) -> List[Document]:
     """Load all PDF documents from the given directory.
 
+    PDF parsing is CPU-bound, so multiple files are parsed in parallel
+    worker processes (one per CPU, at most one per file).
+
     Args:
         data_dir: Path to directory containing PDF files.
 
@@ -29,14 +46,19 @@ def load_documents(data_dir: str) -> List[Document]:
         return []
 
     logger.info("Loading %d documents...", len(pdf_files))
-    for pdf_file in pdf_files:
-        try:
-            loader = PyPDFLoader(pdf_file)
-            docs = loader.load()
-            documents.extend(docs)
-            logger.info("Loaded %s: %d pages", pdf_file, len(docs))
-        except Exception as exc:
-            logger.error("Error loading %s: %s", pdf_file, exc)
+    max_workers = min(len(pdf_files), os.cpu_count() or 1)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_load_pdf, pdf_files))
+    else:
+        results = [_load_pdf(pdf_file) for pdf_file in pdf_files]
+
+    for pdf_file, (docs, error) in zip(pdf_files, results):
+        if error is not None:
+            logger.error("Error loading %s: %s", pdf_file, error)
+            continue
+        documents.extend(docs)
+        logger.info("Loaded %s: %d pages", pdf_file, len(docs))
 
     return documents
 
@@ -48,6 +70,10 @@ def split_documents(
 ) -> List[Document]:
     """Split documents into chunks for embedding.
 
+    Chunks with identical text (repeated headers, boilerplate) are embedded
+    once: the first occurrence is kept and the locations of later copies
+    are recorded in its ``aliases`` metadata as "source (Page N)" strings.
+
     Args:
         documents: List of documents to split.
         chunk_size: Target chunk size in characters.
@@ -61,5 +87,23 @@ def split_documents(
         chunk_overlap=chunk_overlap,
     )
     chunks = text_splitter.split_documents(documents)
-    logger.info("Split into %d chunks.", len(chunks))
-    return chunks
+
+    unique: Dict[bytes, Document] = {}
+    for chunk in chunks:
+        digest = hashlib.blake2b(
+            chunk.page_content.encode("utf-8"), digest_size=16
+        ).digest()
+        first = unique.setdefault(digest, chunk)
+        if first is not chunk:
+            source = chunk.metadata.get("source", "Unknown")
+            page = chunk.metadata.get("page", "Unknown")
+            first.metadata.setdefault("aliases", []).append(f"{source} (Page {page})")
+
+    duplicates = len(chunks) - len(unique)
+    if duplicates:
+        logger.info(
+            "Split into %d chunks (%d duplicates merged).", len(unique), duplicates
+        )
+    else:
+        logger.info("Split into %d chunks.", len(unique))
+    return list(unique.values())
@@ -0,0 +1,207 @@
+"""FAISS vector store service (optional alternative to Chroma).
+
+Requires ``faiss-cpu``. Small corpora use an exact flat L2 index; once there
+are enough chunks to train one, an IVF index partitions the vectors so each
+query only scans ``IVF_NPROBE`` inverted lists instead of every embedding.
+Vectors can optionally be stored quantized: 8-bit scalar codes ("sq8", 4x
+smaller) or product-quantized codes ("pq", 32x smaller).
+"""
+
+import logging
+import math
+import os
+import shutil
+import threading
+from typing import List
+
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from .vectorstore import VectorStoreService
+
+try:
+    import faiss
+except ImportError:  # optional: only needed for vector_backend="faiss"
+    faiss = None
+
+logger = logging.getLogger(__name__)
+
+# IVF sizing: nlist = IVF_LISTS_PER_SQRT_N * sqrt(N); FAISS needs roughly
+# MIN_TRAINING_POINTS_PER_LIST vectors per list to train centroids well.
+IVF_LISTS_PER_SQRT_N = 4
+MIN_TRAINING_POINTS_PER_LIST = 39
+
+# Inverted lists scanned per query
+IVF_NPROBE = 16
+
+# Product quantization: one 8-bit code (256 centroids) per 8 dimensions
+PQ_DIMS_PER_CODE = 8
+PQ_CENTROIDS = 256
+
+
+def _encoding(num_vectors: int, dim: int, quantize: str) -> str:
+    """Return the index_factory vector encoding for the quantization mode.
+
+    PQ needs enough vectors to train 256 centroids per sub-quantizer and a
+    dimension divisible into sub-vectors; otherwise it falls back to SQ8.
+    """
+    if quantize == "sq8":
+        return "SQ8"
+    if quantize == "pq":
+        if (
+            dim % PQ_DIMS_PER_CODE == 0
+            and num_vectors >= MIN_TRAINING_POINTS_PER_LIST * PQ_CENTROIDS
+        ):
+            return f"PQ{dim // PQ_DIMS_PER_CODE}x8"
+        logger.warning(
+            "Too few vectors (%d) to train PQ codes; using SQ8 instead.",
+            num_vectors,
+        )
+        return "SQ8"
+    return "Flat"
+
+
+def _index_description(num_vectors: int, dim: int, quantize: str = "none") -> str:
+    """Return the faiss.index_factory description for a corpus of this size."""
+    encoding = _encoding(num_vectors, dim, quantize)
+    nlist = int(IVF_LISTS_PER_SQRT_N * math.sqrt(num_vectors))
+    if nlist < 2 or num_vectors < MIN_TRAINING_POINTS_PER_LIST * nlist:
+        return encoding
+    return f"IVF{nlist},{encoding}"
+
+
+def _set_nprobe(index: "faiss.Index") -> None:
+    """Set the number of probed lists if index is IVF-based."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = IVF_NPROBE
+
+
+class FaissVectorStoreService(VectorStoreService):
+    """Manage creation and loading of a FAISS vector store.
+
+    Scores from ``similarity_search_with_score`` are squared L2 distances, the
+    same as Chroma's default, so retrieval thresholds carry over unchanged.
+    Rebuilds are written to a staging directory and swapped in with two
+    renames; ``swap_lock`` is held only for the swap, and load() takes it so
+    it never sees a half-replaced index. The replaced index is deleted
+    after the swap, outside the lock.
+    """
+
+    swap_lock = threading.Lock()
+
+    def __init__(
+        self,
+        embedding_function: Embeddings,
+        persist_directory: str,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+        quantize: str = "none",
+    ) -> None:
+        """Initialize the service. Raises ImportError if faiss is not installed.
+
+        Args:
+            embedding_function: Embedding model for document vectors.
+            persist_directory: Directory to save the FAISS index.
+            batch_size: Number of chunks embedded per API request.
+            max_concurrency: Maximum embedding requests in flight at once.
+            quantize: Stored vector encoding: "none", "sq8" or "pq".
+        """
+        if faiss is None:
+            raise ImportError(
+                "vector_backend='faiss' requires faiss. Install it with "
+                "`uv pip install faiss-cpu`."
+            )
+        super().__init__(
+            embedding_function=embedding_function,
+            persist_directory=persist_directory,
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+        )
+        self.quantize = quantize
+
+    def exists(self) -> bool:
+        """Return True if a saved FAISS index exists."""
+        return os.path.exists(os.path.join(self.persist_directory, "index.faiss"))
+
+    def load(self) -> FAISS:
+        """Load existing FAISS index from disk."""
+        logger.info("Loading existing FAISS index...")
+        # The pickled docstore is written by build() below, not untrusted input
+        with self.swap_lock:
+            store = FAISS.load_local(
+                self.persist_directory,
+                self.embedding_function,
+                allow_dangerous_deserialization=True,
+            )
+        _set_nprobe(store.index)
+        self.vector_store = store
+        return store
+
+    def build(self, chunks: List[Document]) -> FAISS:
+        """Build the FAISS index from document chunks and save it to disk.
+
+        The index is rebuilt from scratch each time; unchanged chunks are
+        served from the document embedding cache, so only new chunks cost
+        an embedding request.
+
+        Args:
+            chunks: List of document chunks to embed and store.
+        """
+        if not chunks:
+            raise RuntimeError("No chunks to index.")
+
+        logger.info("Creating embeddings and FAISS index...")
+        ids = self._chunk_ids(chunks)
+        vectors: List[List[float]] = []
+        for _, embeddings in self._iter_embedded_batches(list(zip(ids, chunks))):
+            vectors.extend(embeddings)
+        matrix = np.asarray(vectors, dtype=np.float32)
+
+        description = _index_description(len(matrix), matrix.shape[1], self.quantize)
+        index = faiss.index_factory(matrix.shape[1], description, faiss.METRIC_L2)
+        if not index.is_trained:
+            index.train(matrix)
+        index.add(matrix)
+        _set_nprobe(index)
+
+        store = FAISS(
+            embedding_function=self.embedding_function,
+            index=index,
+            docstore=InMemoryDocstore(
+                {
+                    chunk_id: Document(
+                        page_content=chunk.page_content, metadata=chunk.metadata
+                    )
+                    for chunk_id, chunk in zip(ids, chunks)
+                }
+            ),
+            index_to_docstore_id=dict(enumerate(ids)),
+        )
+        self._save(store)
+        logger.info("Indexed %d chunks (FAISS %s).", len(chunks), description)
+        self.vector_store = store
+        return store
+
+    def _save(self, store: FAISS) -> None:
+        """Save store to a staging directory and swap it in for the live one.
+
+        The previous index stays readable while the new one is written and is
+        deleted once the swap is done, so a one-shot CLI run does not leave a
+        second copy behind.
+        """
+        staging_dir = f"{self.persist_directory}.build"
+        old_dir = f"{self.persist_directory}.old"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        store.save_local(staging_dir)
+
+        with self.swap_lock:
+            # Left behind only if a previous run died before deleting it
+            shutil.rmtree(old_dir, ignore_errors=True)
+            if os.path.exists(self.persist_directory):
+                os.replace(self.persist_directory, old_dir)
+            os.replace(staging_dir, self.persist_directory)
+        shutil.rmtree(old_dir, ignore_errors=True)
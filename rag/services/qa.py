@@ -1,37 +1,45 @@
 """Question-answering chain for basic RAG (no guardrails)."""
 
-from typing import Any
+from typing import Any, Optional
 
-from langchain_chroma import Chroma
 from langchain_classic.chains.retrieval_qa.base import RetrievalQA
+from langchain_core.vectorstores import VectorStore
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 
 def get_llm(
     model: str = "gemini-2.5-flash",
     temperature: float = 1.0,
+    timeout: Optional[float] = None,
+    max_attempts: Optional[int] = None,
 ) -> ChatGoogleGenerativeAI:
     """Initialize the Google Generative AI chat model.
 
     Args:
         model: Model name (e.g., gemini-2.5-flash).
         temperature: Sampling temperature (0-2).
+        timeout: Per-request timeout in seconds (None uses the client default).
+        max_attempts: HTTP attempts per call, including the first; 1 disables
+            retries (None uses the client default of 6).
 
     Returns:
         Configured ChatGoogleGenerativeAI instance.
     """
-    return ChatGoogleGenerativeAI(model=model, temperature=temperature)
+    kwargs = {} if max_attempts is None else {"max_retries": max_attempts}
+    return ChatGoogleGenerativeAI(
+        model=model, temperature=temperature, timeout=timeout, **kwargs
+    )
 
 
 def build_qa_chain(
-    vector_store: Chroma,
+    vector_store: VectorStore,
     llm: Any,
     k: int = 3,
 ) -> RetrievalQA:
     """Create the RetrievalQA chain from a vector store and LLM.
 
     Args:
-        vector_store: Chroma vector store for retrieval.
+        vector_store: Vector store for retrieval (Chroma or FAISS).
         llm: Language model for answer generation.
         k: Number of documents to retrieve.
 
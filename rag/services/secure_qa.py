@@ -1,12 +1,14 @@
 """Secure RAG query with guardrails, prompt injection defense, and evaluation."""
 
 import logging
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, Literal, Optional, Tuple
 
+import httpx
+from langchain_core.exceptions import OutputParserException
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, Field, ValidationError
 
 from ..guardrails import (
     ErrorCode,
@@ -30,8 +32,13 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+INSUFFICIENT_CONTEXT_ANSWER: str = "I don't have enough information to answer that."
 
-@dataclass
+# Fixed replies that make no claim about the context, so are never scored
+_CANNED_REFUSALS = frozenset({INSUFFICIENT_CONTEXT_ANSWER, JAILBREAK_REFUSAL})
+
+
+@dataclass(slots=True)
 class SecureQueryResult:
     """Structured result for secure RAG queries (Assignment 3 output format)."""
 
@@ -45,6 +52,50 @@ class SecureQueryResult:
     injection_blocked: bool = False
 
 
+class AnswerWithFaithfulness(BaseModel):
+    """Structured LLM output: the answer plus a self-assessed faithfulness score."""
+
+    answer: str = Field(description="The answer to the user's question.")
+    faithfulness_score: Literal["Yes", "No"] = Field(
+        description=(
+            "'Yes' if the answer is fully supported by the retrieved context, "
+            "otherwise 'No'."
+        )
+    )
+
+
+def _generate_answer(
+    llm: BaseChatModel,
+    messages: List[BaseMessage],
+    timeout_seconds: int,
+    with_faithfulness: bool,
+) -> Tuple[str, Optional[str]]:
+    """Generate an answer, scoring faithfulness in the same call when requested.
+
+    With ``with_faithfulness`` the model returns an AnswerWithFaithfulness, so
+    answer and score cost one round trip. If structured output is unsupported
+    or fails to parse, falls back to a plain call and returns a None score so
+    the caller can run the separate faithfulness evaluation. API, client and
+    timeout errors propagate, so a failed request is never sent twice.
+
+    Returns:
+        Tuple of (answer, faithfulness_score or None).
+    """
+    if with_faithfulness:
+        try:
+            structured = llm.with_structured_output(AnswerWithFaithfulness).invoke(
+                messages, timeout=timeout_seconds
+            )
+            if isinstance(structured, AnswerWithFaithfulness):
+                return structured.answer, structured.faithfulness_score
+        except (OutputParserException, ValidationError, NotImplementedError) as exc:
+            logger.debug("Structured answer failed, using separate evaluation: %s", exc)
+
+    response = llm.invoke(messages, timeout=timeout_seconds)
+    answer = response.content if hasattr(response, "content") else str(response)
+    return answer, None
+
+
 def query_secure(
     question: str,
     vector_store: "VectorStore",
@@ -60,7 +111,8 @@ def query_secure(
 
     Applies input guardrails (length, off-topic, PII), injection detection,
     retrieval with confidence threshold, LLM call with timeout, output validation,
-    and optional faithfulness evaluation.
+    and optional faithfulness evaluation (scored in the answer call when the
+    model supports structured output).
 
     Args:
         question: The user's question.
@@ -68,7 +120,8 @@ def query_secure(
         llm: Chat model for answer generation.
         k: Number of chunks to retrieve.
         retrieval_threshold: Minimum similarity score to accept retrieval.
-        timeout_seconds: LLM call timeout.
+        timeout_seconds: Timeout per LLM HTTP attempt, enforced by the model's
+            HTTP client; the model's retry setting bounds the attempts.
         max_response_words: Maximum response length in words.
         run_faithfulness: Whether to run faithfulness evaluation.
 
@@ -107,7 +160,7 @@ def query_secure(
     except Exception as exc:
         logger.debug("Retrieval failed: %s", exc)
         result.error_code = ErrorCode.RETRIEVAL_EMPTY
-        result.answer = "I don't have enough information to answer that."
+        result.answer = INSUFFICIENT_CONTEXT_ANSWER
         result.guardrails_triggered.append("retrieval_error")
         return result
 
@@ -121,7 +174,7 @@ def query_secure(
     if not docs_with_scores or below_threshold:
         result.guardrails_triggered.append("retrieval_empty_or_low_confidence")
         result.error_code = ErrorCode.RETRIEVAL_EMPTY
-        result.answer = "I don't have enough information to answer that."
+        result.answer = INSUFFICIENT_CONTEXT_ANSWER
         return result
 
     # Build context with instruction-data separation
@@ -131,24 +184,20 @@ def query_secure(
 
     system_content = f"""{SYSTEM_PROMPT_HARDENED}
 
-Use the following retrieved context to answer the question. If the context does not contain enough information, say "I don't have enough information to answer that."
+Use the following retrieved context to answer the question. If the context does not contain enough information, say "{INSUFFICIENT_CONTEXT_ANSWER}"
 
 {wrapped_context}"""
 
-    # --- LLM call with timeout (cross-platform via ThreadPoolExecutor) ---
-    def _invoke_llm() -> object:
-        return llm.invoke(
-            [
-                SystemMessage(content=system_content),
-                HumanMessage(content=query_to_use),
-            ]
-        )
-
+    # --- LLM call with timeout (passed through to the HTTP request) ---
+    messages: List[BaseMessage] = [
+        SystemMessage(content=system_content),
+        HumanMessage(content=query_to_use),
+    ]
     try:
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(_invoke_llm)
-            response = future.result(timeout=timeout_seconds)
-    except FuturesTimeoutError:
+        answer, faith_score = _generate_answer(
+            llm, messages, timeout_seconds, with_faithfulness=run_faithfulness
+        )
+    except (httpx.TimeoutException, TimeoutError):
         result.error_code = ErrorCode.LLM_TIMEOUT
         result.guardrails_triggered.append("llm_timeout")
         result.answer = "Request timed out. Please try again."
@@ -158,8 +207,6 @@ Use the following retrieved context to answer the question. If the context does
         result.answer = f"An error occurred: {exc!s}"
         return result
 
-    answer = response.content if hasattr(response, "content") else str(response)
-
     # --- Output guardrail: response length ---
     length_result = check_response_length(answer, max_words=max_response_words)
     if length_result.sanitized_query:
@@ -176,9 +223,10 @@ Use the following retrieved context to answer the question. If the context does
 
     result.answer = (result.answer or "") + answer
 
-    # --- Faithfulness evaluation ---
-    if run_faithfulness and answer:
-        faith_score, _ = evaluate_faithfulness(answer, context_str, llm)
+    # --- Faithfulness evaluation (separate call only if not already scored) ---
+    if run_faithfulness and answer and answer.strip() not in _CANNED_REFUSALS:
+        if faith_score is None:
+            faith_score, _ = evaluate_faithfulness(answer, context_str, llm)
         result.faithfulness_score = faith_score
 
     return result
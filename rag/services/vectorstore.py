@@ -1,9 +1,10 @@
 """Chroma vector store service for document embeddings."""
 
+import hashlib
 import logging
 import os
-import shutil
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
@@ -11,6 +12,9 @@ from langchain_core.embeddings import Embeddings
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on inputs per Jina embeddings request
+MAX_EMBEDDING_BATCH_SIZE = 2048
+
 
 class VectorStoreService:
     """Manage creation and loading of the Chroma vector store."""
@@ -19,15 +23,21 @@ class VectorStoreService:
         self,
         embedding_function: Embeddings,
         persist_directory: str,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
     ) -> None:
         """Initialize the service.
 
         Args:
             embedding_function: Embedding model for document vectors.
             persist_directory: Directory to persist the Chroma database.
+            batch_size: Number of chunks embedded per API request.
+            max_concurrency: Maximum embedding requests in flight at once.
         """
         self.embedding_function = embedding_function
         self.persist_directory = persist_directory
+        self.batch_size = max(1, min(batch_size, MAX_EMBEDDING_BATCH_SIZE))
+        self.max_concurrency = max(1, max_concurrency)
         self.vector_store: Optional[Chroma] = None
 
     def exists(self) -> bool:
@@ -43,25 +53,99 @@ class VectorStoreService:
         )
         return self.vector_store
 
-    def build(
-        self,
-        chunks: List[Document],
-        force_recreate: bool = False,
-    ) -> Chroma:
-        """Build vector store from document chunks.
+    def _chunk_ids(self, chunks: List[Document]) -> List[str]:
+        """Return deterministic ids derived from each chunk's content.
+
+        The id hashes the embedding model, source, page, text and any
+        duplicate-location aliases, so an unchanged chunk keeps its id across
+        rebuilds. Repeated identical chunks get an occurrence suffix to keep
+        ids unique.
+        """
+        model_name = getattr(self.embedding_function, "model_name", "")
+        seen: Dict[str, int] = {}
+        ids: List[str] = []
+        for chunk in chunks:
+            raw = "\0".join(
+                (
+                    model_name,
+                    str(chunk.metadata.get("source", "")),
+                    str(chunk.metadata.get("page", "")),
+                    chunk.page_content,
+                )
+            )
+            aliases = chunk.metadata.get("aliases")
+            if aliases:
+                raw += "\0" + "\0".join(aliases)
+            chunk_id = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+            count = seen.get(chunk_id, 0)
+            seen[chunk_id] = count + 1
+            ids.append(chunk_id if count == 0 else f"{chunk_id}-{count}")
+        return ids
+
+    def _iter_embedded_batches(
+        self, items: List[Tuple[str, Document]]
+    ) -> Iterator[Tuple[List[Tuple[str, Document]], List[List[float]]]]:
+        """Embed (id, chunk) pairs in batches, yielding each batch with its vectors.
+
+        Up to ``max_concurrency`` embedding requests run at once; batches are
+        yielded in order, so the caller can store one while later ones embed.
+        """
+        batches = [
+            items[start : start + self.batch_size]
+            for start in range(0, len(items), self.batch_size)
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            batch_embeddings = executor.map(
+                self.embedding_function.embed_documents,
+                [[chunk.page_content for _, chunk in batch] for batch in batches],
+            )
+            yield from zip(batches, batch_embeddings)
+
+    def build(self, chunks: List[Document]) -> Chroma:
+        """Build or incrementally update the vector store from document chunks.
+
+        Chunks are identified by content-derived ids: entries no longer present
+        are deleted and only new chunks are embedded, so rebuilding an
+        unchanged corpus makes no embedding calls. New chunks are embedded in
+        batches of ``batch_size`` (one API request per batch), with up to
+        ``max_concurrency`` requests in flight, and written to the collection
+        in order with their precomputed vectors.
 
         Args:
             chunks: List of document chunks to embed and store.
-            force_recreate: If True, remove existing store before building.
         """
-        if force_recreate and self.exists():
-            logger.info("Rebuilding vector store: removing existing index...")
-            shutil.rmtree(self.persist_directory, ignore_errors=True)
-
         logger.info("Creating embeddings and vector store...")
-        self.vector_store = Chroma.from_documents(
-            documents=chunks,
-            embedding=self.embedding_function,
+        self.vector_store = Chroma(
+            embedding_function=self.embedding_function,
             persist_directory=self.persist_directory,
         )
+        collection = self.vector_store._collection
+
+        ids = self._chunk_ids(chunks)
+        existing = set(collection.get(include=[])["ids"])
+        stale = existing.difference(ids)
+        if stale:
+            collection.delete(ids=list(stale))
+        pending = [
+            (chunk_id, chunk)
+            for chunk_id, chunk in zip(ids, chunks)
+            if chunk_id not in existing
+        ]
+
+        for batch, embeddings in self._iter_embedded_batches(pending):
+            collection.add(
+                ids=[chunk_id for chunk_id, _ in batch],
+                embeddings=embeddings,
+                documents=[chunk.page_content for _, chunk in batch],
+                metadatas=[chunk.metadata or None for _, chunk in batch],
+            )
+        logger.info(
+            "Vector store synced: %d added, %d removed, %d unchanged "
+            "(batches of %d, %d concurrent requests).",
+            len(pending),
+            len(stale),
+            len(chunks) - len(pending),
+            self.batch_size,
+            self.max_concurrency,
+        )
         return self.vector_store